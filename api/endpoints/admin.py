@@ -0,0 +1,48 @@
+import asyncio
+import logging
+
+from enum import Enum
+from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+
+from core.profiler import profiler
+
+router = APIRouter(prefix="/admin")
+
+logger = logging.getLogger(__name__)
+
+
+class ProfileFormat(Enum):
+    collapsed = "collapsed"
+    speedscope = "speedscope"
+
+
+@router.get("/profile")
+async def collect_profile(seconds: float = Query(5, gt=0, le=60),
+                          interval_ms: float = Query(5, ge=1, le=1000),
+                          format: ProfileFormat = ProfileFormat.collapsed):
+
+    logger.info(f"Recived request to profile for {seconds}s")
+
+    if not profiler.available():
+        data = {"status": "error", "msg": "profiling not supported"}
+        logger.error("Sampling profiler not supported on this platform")
+        raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED,
+                            detail=data)
+
+    if profiler.running:
+        data = {"status": "error", "msg": "profiler already running"}
+        logger.error("Profile requested while another is running")
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=data)
+
+    profiler.start(interval=interval_ms / 1000)
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        profiler.stop()
+
+    logger.info("Profile collected successfully")
+
+    if format == ProfileFormat.speedscope:
+        return profiler.speedscope()
+    return PlainTextResponse(profiler.collapsed())
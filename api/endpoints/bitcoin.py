@@ -22,14 +22,7 @@ def get_bitcoin_rate() -> BitcoinIn:
     return obj
 
 
-@router.put("/", response_model=BitcoinIn)
-async def update_bitcoin_rate(obj: BitcoinIn,
-                              rate_obj: BitcoinIn = Depends(get_bitcoin_rate)):
-
-    logger.info(msg="Recived request to update bitcoin rate")
-
-    price = obj.price
-
+def check_rate(price: float) -> float:
     if price <= 0:
         data = {"status": "error", "msg": "invalid bitcoin rate"}
         logger.info(msg="Invalid bitcoin rate recieved (negative)")
@@ -43,11 +36,24 @@ async def update_bitcoin_rate(obj: BitcoinIn,
         logger.info(msg="Invalid bitcoin rate recieved (Huge)")
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
                             detail=data)
+    return price
 
-    rate_obj.price = price
+
+def set_bitcoin_rate(rate_obj: BitcoinIn, price: float) -> BitcoinIn:
+    rate_obj.price = check_rate(price)
     rate_obj.updatedAt = datetime.now()
 
     in_memory_datastore["bitcoin_rate"] = rate_obj
+    return rate_obj
+
+
+@router.put("/", response_model=BitcoinIn)
+async def update_bitcoin_rate(obj: BitcoinIn,
+                              rate_obj: BitcoinIn = Depends(get_bitcoin_rate)):
+
+    logger.info(msg="Recived request to update bitcoin rate")
+
+    rate_obj = set_bitcoin_rate(rate_obj, price=obj.price)
 
     logger.info(msg="Bitcoin rate updated successfully")
 
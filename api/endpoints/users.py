@@ -1,16 +1,39 @@
+import base64
+import json
 import logging
-from fastapi import APIRouter, HTTPException, status
+import math
+
+from datetime import datetime
+from typing import Any, Optional, Tuple
+from fastapi import APIRouter, HTTPException, Query, status
 
 from core.config import settings
 from crud import user_crud
 
-from schema import UserIn, UserOut, UserUpdate, UserUsdTransaction, UserBitcoinTransaction, UserBalance
+from schema import UserIn, UserOut, UserUpdate, UserUsdTransaction, UserBitcoinTransaction, UserBalance, UserPage, UserSortField, SortOrder, UsdAction, BitcoinAction
 
 router = APIRouter(prefix="/users")
 logger = logging.getLogger(__name__)
 
+# Parsed once at import instead of on every transaction.
+USD_LIMIT = float(settings.USD_LIMIT)
+BITCOIN_LIMIT = float(settings.BITCOIN_LIMIT)
+
+USD_ACTIONS = {
+    UsdAction.deposit: user_crud.deposit,
+    UsdAction.withdraw: user_crud.withdrawal,
+}
+BITCOIN_ACTIONS = {
+    BitcoinAction.buy: user_crud.buy,
+    BitcoinAction.sell: user_crud.sell,
+}
+
 
 def check_figures(price, bitcoin: bool = False):
+    limit = BITCOIN_LIMIT if bitcoin else USD_LIMIT
+    if 0 < price <= limit:
+        return price
+
     if price < 0:
         data = {"status": "error", "msg": "invalid amount"}
         if bitcoin:
@@ -21,34 +44,172 @@ def check_figures(price, bitcoin: bool = False):
                             detail=data)
     if price == 0:
         data = {"status": "error", "msg": "invalid amount"}
-        if bitcoin:
-            logger.error("Invalid amount passed in")
-        else:
-            logger.error("Invalid amount passed in")
+        logger.error("Invalid amount passed in")
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
                             detail=data)
     if bitcoin:
-        if price > settings.BITCOIN_LIMIT:
-            data = {
-                "status": "error",
-                "msg": "user can not buy or sell more than 100 bitcoins"
-            }
-            logger.error(
-                "User attempted to buy or sell bitcoin amount above limit")
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
-                                detail=data)
+        data = {
+            "status": "error",
+            "msg": "user can not buy or sell more than 100 bitcoins"
+        }
+        logger.error(
+            "User attempted to buy or sell bitcoin amount above limit")
     else:
-        if price > settings.USD_LIMIT:
-            data = {
-                "status": "error",
-                "msg": "can not deposit or withdraw such figures "
-            }
-            logger.error(
-                "User attempted to withdraw or depoist amount (usd) above limit"
-            )
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
-                                detail=data)
-    return price
+        data = {
+            "status": "error",
+            "msg": "can not deposit or withdraw such figures "
+        }
+        logger.error(
+            "User attempted to withdraw or depoist amount (usd) above limit")
+    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=data)
+
+
+def process_transaction(id: str, user_trans, actions, bitcoin: bool = False):
+    """Validate a transaction and apply it in one pass
+
+    Checks the user exists and the amount is within limits, then hands
+    the already fetched user to the crud method so it is not looked up a
+    second time.
+
+    Args:
+        id (str): the user id
+        user_trans: a UserUsdTransaction or UserBitcoinTransaction
+        actions: maps each action enum member to its crud method
+        bitcoin (bool): apply the bitcoin limit instead of the usd one
+
+    Returns:
+        UserInDb: the updated user
+    """
+    data_obj = user_crud.get(id=id)
+    if not data_obj:
+        data = {"status": "error", "msg": "user with id does not exists"}
+        logger.error("User with this id doesn't exist")
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=data)
+
+    check_figures(price=user_trans.amount, bitcoin=bitcoin)
+
+    # Unknown actions never get here, pydantic rejects them with a 422.
+    action = actions[user_trans.action]
+
+    logger.info(f"User: {id} performing {user_trans.action.value}")
+    user_obj = action(id=id, amount=user_trans.amount, obj=data_obj)
+    if not user_obj["successful"]:
+        data = {"status": "error", "msg": user_obj["msg"]}
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=data)
+
+    logger.info(f"User: {id} {user_trans.action} performmed sucessfully")
+    return user_obj["data"]
+
+
+def to_naive(value: Any) -> Any:
+    # Stored timestamps come from datetime.now(), naive local time, and
+    # can not be compared with aware datetimes.
+    if not isinstance(value, datetime) or value.tzinfo is None:
+        return value
+    return value.astimezone().replace(tzinfo=None)
+
+
+def is_nan(value: Any) -> bool:
+    return isinstance(value, float) and math.isnan(value)
+
+
+def encode_cursor(sort_by: UserSortField, obj: Any) -> str:
+    value = getattr(obj, sort_by.value)
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps([sort_by.value, value, obj.id])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str, sort_by: UserSortField) -> Tuple[Any, str]:
+    try:
+        field, value, _id = json.loads(base64.urlsafe_b64decode(cursor))
+        if field != sort_by.value:
+            raise ValueError("cursor was issued for another sort field")
+        if not isinstance(_id, str):
+            raise TypeError("cursor id must be a string")
+        if sort_by in (UserSortField.createdAt, UserSortField.updatedAt):
+            value = to_naive(datetime.fromisoformat(value))
+        else:
+            value = float(value)
+            if is_nan(value):
+                raise ValueError("cursor value is not a number")
+    except (ValueError, TypeError, OverflowError):
+        data = {"status": "error", "msg": "invalid cursor"}
+        logger.error("Invalid pagination cursor passed in")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=data)
+    return (value, _id)
+
+
+@router.get("/", response_model=UserPage)
+async def list_users(sort_by: UserSortField = UserSortField.createdAt,
+                     order: SortOrder = SortOrder.asc,
+                     limit: int = Query(50, ge=1, le=500),
+                     cursor: Optional[str] = None,
+                     created_after: Optional[datetime] = None,
+                     created_before: Optional[datetime] = None,
+                     updated_after: Optional[datetime] = None,
+                     updated_before: Optional[datetime] = None,
+                     usd_balance_min: Optional[float] = None,
+                     usd_balance_max: Optional[float] = None,
+                     bitcoin_amount_min: Optional[float] = None,
+                     bitcoin_amount_max: Optional[float] = None):
+    """List users a page at a time, ordered by sort_by.
+
+    Range filters are only accepted on the sort_by field, so they resolve
+    against its index and a page costs O(log n + limit).
+    """
+
+    logger.info(f"attempting to list users by {sort_by.value}")
+
+    after = decode_cursor(cursor, sort_by) if cursor else None
+
+    ranges = {
+        UserSortField.createdAt: (created_after, created_before),
+        UserSortField.updatedAt: (updated_after, updated_before),
+        UserSortField.usdBalance: (usd_balance_min, usd_balance_max),
+        UserSortField.bitcoinAmount: (bitcoin_amount_min, bitcoin_amount_max),
+    }
+    if any(bounds != (None, None) for field, bounds in ranges.items()
+           if field != sort_by):
+        data = {
+            "status": "error",
+            "msg": "range filters must be on the sort_by field"
+        }
+        logger.error("Range filter passed in for a field other than sort_by")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=data)
+
+    lower, upper = ranges[sort_by]
+    try:
+        lower, upper = to_naive(lower), to_naive(upper)
+        valid = not (is_nan(lower) or is_nan(upper))
+    except OverflowError:
+        valid = False
+    if not valid:
+        data = {"status": "error", "msg": "invalid filter"}
+        logger.error("Invalid range filter passed in")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=data)
+
+    # One extra row tells us whether another page exists.
+    objs = user_crud.get_multi(sort_by=sort_by.value,
+                               limit=limit + 1,
+                               descending=order == SortOrder.desc,
+                               after=after,
+                               lower=lower,
+                               upper=upper)
+
+    next_cursor = None
+    if len(objs) > limit:
+        objs = objs[:limit]
+        next_cursor = encode_cursor(sort_by, objs[-1])
+
+    logger.info(f"{len(objs)} users listed successfully")
+
+    data = {"data": [obj.dict() for obj in objs], "next_cursor": next_cursor}
+    return data
 
 
 @router.post("/", response_model=UserOut, status_code=201)
@@ -114,34 +275,9 @@ async def update_user(id: str, update_obj: UserUpdate):
 async def usd_balance(id: str, user_trans: UserUsdTransaction):
     logger.info(f"User: {id} usd transaction initialized")
 
-    data_obj = user_crud.get(id=id)
-    if not data_obj:
-        data = {"status": "error", "msg": "user with id does not exists"}
-        logger.error("User with this id doesn't exist")
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=data)
-
-    check_figures(price=user_trans.amount)
-
-    if user_trans.action.value == "deposit":
-        logger.info(f"User: {id} performing a deposit transaction")
-        user_obj = user_crud.deposit(id=id, amount=user_trans.amount)
-
-    elif user_trans.action.value == "withdraw":
-        logger.info(f"User: {id} performing a withdrawal transaction")
-        user_obj = user_crud.withdrawal(id=id, amount=user_trans.amount)
-        if not user_obj["successful"]:
-            data = {"status": "error", "msg": user_obj["msg"]}
-            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN,
-                                detail=data)
-
-    else:
-        data = {"status": "error", "msg": "invalid action"}
-        logger.error(f"User: {id} tried unknown action")
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
-                            detail=data)
-    logger.info(f"User: {id} {user_trans.action} performmed sucessfully")
+    user_obj = process_transaction(id, user_trans, USD_ACTIONS)
 
-    data = user_obj["data"].dict()
+    data = user_obj.dict()
     return data
 
 
@@ -149,38 +285,12 @@ async def usd_balance(id: str, user_trans: UserUsdTransaction):
 async def bitcoin_balance(id: str, user_trans: UserBitcoinTransaction):
     logger.info(f"User: {id} bitcoin transaction initialized")
 
-    data_obj = user_crud.get(id=id)
-    if not data_obj:
-        data = {"status": "error", "msg": "user with id does not exists"}
-        logger.error("User with this id doesn't exist")
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=data)
-
-    check_figures(price=user_trans.amount, bitcoin=True)
-
-    if user_trans.action.value == "buy":
-        logger.info(f"User: {id} buying bitcoin")
-        user_obj = user_crud.buy(id=id, amount=user_trans.amount)
-        if not user_obj["successful"]:
-            data = {"status": "error", "msg": user_obj["msg"]}
-            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN,
-                                detail=data)
-
-    elif user_trans.action.value == "sell":
-        logger.info(f"User: {id} selling bitcoin")
-        user_obj = user_crud.sell(id=id, amount=user_trans.amount)
-        if not user_obj["successful"]:
-            data = {"status": "error", "msg": user_obj["msg"]}
-            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN,
-                                detail=data)
-    else:
-        data = {"status": "error", "msg": "invalid action"}
-        logger.error(f"User: {id} attempted unknown action")
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
-                            detail=data)
-
-    logger.info(f"User: {id} {user_trans.action} performmed sucessfully")
+    user_obj = process_transaction(id,
+                                   user_trans,
+                                   BITCOIN_ACTIONS,
+                                   bitcoin=True)
 
-    data = user_obj["data"].dict()
+    data = user_obj.dict()
     return data
 
 
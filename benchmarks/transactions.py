@@ -0,0 +1,201 @@
+"""Per-request CPU cost of the usd and bitcoin transaction endpoints
+
+Run from the repo root with `python -m benchmarks.transactions`.
+
+The legacy handlers below are the endpoint bodies and check_figures as
+they were before process_transaction, reading settings on every call and
+letting the crud methods fetch the user a second time. Both sides run
+with logging unconfigured, so info records are dropped without being
+formatted or written.
+"""
+import timeit
+
+from fastapi import HTTPException, status
+
+from api.endpoints.users import logger, router
+from core.config import settings
+from crud import user_crud
+from schema import UserIn, UserUsdTransaction, UserBitcoinTransaction
+
+NUMBER = 1000
+REPEAT = 40
+
+
+def legacy_check_figures(price, bitcoin: bool = False):
+    if price < 0:
+        data = {"status": "error", "msg": "invalid amount"}
+        if bitcoin:
+            logger.error("Negative bitcoin amount passed in")
+        else:
+            logger.error("Negative amount(usd) passed in")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=data)
+    if price == 0:
+        data = {"status": "error", "msg": "invalid amount"}
+        if bitcoin:
+            logger.error("Invalid amount passed in")
+        else:
+            logger.error("Invalid amount passed in")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=data)
+    if bitcoin:
+        if price > settings.BITCOIN_LIMIT:
+            data = {
+                "status": "error",
+                "msg": "user can not buy or sell more than 100 bitcoins"
+            }
+            logger.error(
+                "User attempted to buy or sell bitcoin amount above limit")
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                                detail=data)
+    else:
+        if price > settings.USD_LIMIT:
+            data = {
+                "status": "error",
+                "msg": "can not deposit or withdraw such figures "
+            }
+            logger.error(
+                "User attempted to withdraw or depoist amount (usd) above limit"
+            )
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                                detail=data)
+    return price
+
+
+async def legacy_usd_balance(id: str, user_trans: UserUsdTransaction):
+    logger.info(f"User: {id} usd transaction initialized")
+
+    data_obj = user_crud.get(id=id)
+    if not data_obj:
+        data = {"status": "error", "msg": "user with id does not exists"}
+        logger.error("User with this id doesn't exist")
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=data)
+
+    legacy_check_figures(price=user_trans.amount)
+
+    if user_trans.action.value == "deposit":
+        logger.info(f"User: {id} performing a deposit transaction")
+        user_obj = user_crud.deposit(id=id, amount=user_trans.amount)
+
+    elif user_trans.action.value == "withdraw":
+        logger.info(f"User: {id} performing a withdrawal transaction")
+        user_obj = user_crud.withdrawal(id=id, amount=user_trans.amount)
+        if not user_obj["successful"]:
+            data = {"status": "error", "msg": user_obj["msg"]}
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN,
+                                detail=data)
+
+    else:
+        data = {"status": "error", "msg": "invalid action"}
+        logger.error(f"User: {id} tried unknown action")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=data)
+    logger.info(f"User: {id} {user_trans.action} performmed sucessfully")
+
+    data = user_obj["data"].dict()
+    return data
+
+
+async def legacy_bitcoin_balance(id: str, user_trans: UserBitcoinTransaction):
+    logger.info(f"User: {id} bitcoin transaction initialized")
+
+    data_obj = user_crud.get(id=id)
+    if not data_obj:
+        data = {"status": "error", "msg": "user with id does not exists"}
+        logger.error("User with this id doesn't exist")
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=data)
+
+    legacy_check_figures(price=user_trans.amount, bitcoin=True)
+
+    if user_trans.action.value == "buy":
+        logger.info(f"User: {id} buying bitcoin")
+        user_obj = user_crud.buy(id=id, amount=user_trans.amount)
+        if not user_obj["successful"]:
+            data = {"status": "error", "msg": user_obj["msg"]}
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN,
+                                detail=data)
+
+    elif user_trans.action.value == "sell":
+        logger.info(f"User: {id} selling bitcoin")
+        user_obj = user_crud.sell(id=id, amount=user_trans.amount)
+        if not user_obj["successful"]:
+            data = {"status": "error", "msg": user_obj["msg"]}
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN,
+                                detail=data)
+    else:
+        data = {"status": "error", "msg": "invalid action"}
+        logger.error(f"User: {id} attempted unknown action")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=data)
+
+    logger.info(f"User: {id} {user_trans.action} performmed sucessfully")
+
+    data = user_obj["data"].dict()
+    return data
+
+
+def endpoint(path: str):
+    for route in router.routes:
+        if route.path == path and "POST" in route.methods:
+            return route.endpoint
+    raise LookupError(path)
+
+
+def run(coro):
+    # The handlers never await, so one send runs them to completion.
+    try:
+        coro.send(None)
+    except StopIteration as e:
+        return e.value
+    raise RuntimeError("handler suspended")
+
+
+def pair(handler, id, first, second):
+    # Each call applies a transaction and its inverse, keeping balances
+    # steady across repeats.
+    def call():
+        run(handler(id, first))
+        run(handler(id, second))
+
+    return call
+
+
+def measure(legacy, fast):
+    """Best per-transaction times in microseconds
+
+    Repeats alternate between the two handlers so drift in machine load
+    affects both sides equally.
+    """
+    before = after = float("inf")
+    for _ in range(REPEAT):
+        before = min(before, timeit.timeit(legacy, number=NUMBER))
+        after = min(after, timeit.timeit(fast, number=NUMBER))
+    scale = 1e6 / NUMBER / 2
+    return before * scale, after * scale
+
+
+def main():
+    user = user_crud.create(obj_in=UserIn(
+        username="bench", email="bench@example.com", name="bench"))
+    user_crud.deposit(id=user.id, amount=1000000)
+
+    usd = (UserUsdTransaction(action="deposit", amount=1),
+           UserUsdTransaction(action="withdraw", amount=1))
+    bitcoin = (UserBitcoinTransaction(action="buy", amount=0.01),
+               UserBitcoinTransaction(action="sell", amount=0.01))
+
+    cases = (
+        ("usd", legacy_usd_balance, endpoint("/users/{id}/usd"), usd),
+        ("bitcoin", legacy_bitcoin_balance, endpoint("/users/{id}/bitcoins"),
+         bitcoin),
+    )
+    for name, legacy, fast, (first, second) in cases:
+        before, after = measure(pair(legacy, user.id, first, second),
+                                pair(fast, user.id, first, second))
+        print(f"{name}: legacy {before:.2f}us, fast path {after:.2f}us, "
+              f"saved {before - after:.2f}us "
+              f"({(before - after) / before:.0%}) per transaction")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 from logging import DEBUG
 import os
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 from dotenv import load_dotenv
 from pydantic import BaseSettings, AnyHttpUrl
@@ -20,6 +20,16 @@ class Settings(BaseSettings):
     API_V1_0STR: str = "/v1_0"
     USD_LIMIT: float = os.environ.get("USD_LIMIT", 999999)
     BITCOIN_LIMIT: float = os.environ.get("BITCOIN_LIMIT", 100)
+    LOGGING_CACHE: bool = os.environ.get("LOGGING_CACHE", False)
+    STARTUP_BUDGET_MS: float = os.environ.get("STARTUP_BUDGET_MS", 1000)
+    PROFILER_ENABLED: bool = os.environ.get("PROFILER_ENABLED", False)
+    RATE_FEED: str = os.environ.get("RATE_FEED", "")
+    RATE_FEED_HZ: float = os.environ.get("RATE_FEED_HZ", 10)
+    RATE_FEED_VOLATILITY: float = os.environ.get("RATE_FEED_VOLATILITY", 0.001)
+    RATE_FEED_DRIFT: float = os.environ.get("RATE_FEED_DRIFT", 0.0)
+    RATE_FEED_SEED: Optional[int] = os.environ.get("RATE_FEED_SEED")
+    RATE_FEED_FILE: str = os.environ.get("RATE_FEED_FILE", "")
+    RATE_FEED_SPEED: float = os.environ.get("RATE_FEED_SPEED", 1.0)
 
 
 # To do, ask the signnifcance of some of these variables.
@@ -1,25 +1,48 @@
+from typing import Optional
+
 from fastapi import FastAPI
 
 from starlette.middleware.cors import CORSMiddleware
 
 from api.api import router
 from core.config import settings
-from core.middleware import RequestContextLogMiddleware
 from core.logger import setup_logging
+from core.middleware import RequestContextLogMiddleware
+from core.startup import StartupProfile
+
+
+def create_app(profile: Optional[StartupProfile] = None):
+    profile = profile or StartupProfile()
+
+    with profile.step("setup_logging"):
+        setup_logging()
+
+    with profile.step("build app"):
+        app = FastAPI(title=settings.API_TITLE)
+
+        app.include_router(router)
 
+        if settings.PROFILER_ENABLED:
+            from api.endpoints.admin import router as admin_router
+            app.include_router(admin_router, tags=["admin"])
 
-def create_app():
-    app = FastAPI(title=settings.API_TITLE)
+        app.add_middleware(CORSMiddleware,
+                           allow_origins=['*'],
+                           allow_credentials=True,
+                           allow_methods=['*'],
+                           allow_headers=['*'])
 
-    app.include_router(router)
+        app.add_middleware(RequestContextLogMiddleware)
 
-    app.add_middleware(CORSMiddleware,
-                       allow_origins=['*'],
-                       allow_credentials=True,
-                       allow_methods=['*'],
-                       allow_headers=['*'])
+    if settings.RATE_FEED:
+        with profile.step("rate feed"):
+            from core.rate_feed import build_rate_feed
+            feed = build_rate_feed(settings)
+        app.add_event_handler("startup", feed.start)
+        app.add_event_handler("shutdown", feed.stop)
 
-    app.add_middleware(RequestContextLogMiddleware)
-    setup_logging()
+    @app.on_event("startup")
+    def report_startup():
+        profile.report(budget_ms=settings.STARTUP_BUDGET_MS)
 
     return app
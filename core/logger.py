@@ -1,6 +1,11 @@
+import json
 import logging.config
-import yaml
+import os
+import tempfile
 
+from pathlib import Path
+
+from core.config import settings
 from core.middleware import get_request_id, get_correlation_id
 
 
@@ -12,8 +17,47 @@ class AppFilter(object):
         return True
 
 
-def setup_logging():
-    with open('logging.yaml') as f:
+def load_logging_config(path: str = 'logging.yaml') -> dict:
+    """Parse the logging config, reusing a json copy when it is fresh
+
+    yaml is only imported when the cache is disabled or stale, json
+    parsing is a fraction of the cost of yaml.FullLoader.
+
+    Args:
+        path (str): path to the yaml logging config
+
+    Returns:
+        dict: config suitable for logging.config.dictConfig
+    """
+    source = Path(path)
+    cache = source.with_suffix('.cache.json')
+
+    if settings.LOGGING_CACHE and cache.exists() and (cache.stat().st_mtime >=
+                                                      source.stat().st_mtime):
+        with open(cache) as f:
+            return json.load(f)
+
+    import yaml
+
+    with open(source) as f:
         conf = yaml.load(f, Loader=yaml.FullLoader)
 
-    logging.config.logging.config.dictConfig(conf)
\ No newline at end of file
+    if settings.LOGGING_CACHE:
+        # Write then rename so concurrently starting workers never read a
+        # partially written cache.
+        fd, tmp = tempfile.mkstemp(dir=cache.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(conf, f)
+            os.replace(tmp, cache)
+        except Exception:
+            os.unlink(tmp)
+            raise
+
+    return conf
+
+
+def setup_logging():
+    conf = load_logging_config()
+
+    logging.config.dictConfig(conf)
@@ -14,11 +14,14 @@ logger = logging.getLogger(__name__)
 
 CORRELATION_ID_CTX_KEY = 'correlation_id'
 REQUEST_ID_CTX_KEY = 'request_id'
+REQUEST_SCOPE_CTX_KEY = 'request_scope'
 
 _correlation_id_ctx_var: ContextVar[str] = ContextVar(CORRELATION_ID_CTX_KEY,
                                                       default=None)
 _request_id_ctx_var: ContextVar[str] = ContextVar(REQUEST_ID_CTX_KEY,
                                                   default=None)
+_request_scope_ctx_var: ContextVar[dict] = ContextVar(REQUEST_SCOPE_CTX_KEY,
+                                                      default=None)
 
 
 def get_correlation_id() -> str:
@@ -29,12 +32,17 @@ def get_request_id() -> str:
     return _request_id_ctx_var.get()
 
 
+def get_request_scope() -> dict:
+    return _request_scope_ctx_var.get()
+
+
 class RequestContextLogMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request,
                        call_next: RequestResponseEndpoint):
         correlation_id = _correlation_id_ctx_var.set(
             request.headers.get('X-Correlation-ID', str(uuid4())))
         request_id = _request_id_ctx_var.set(str(uuid4()))
+        _request_scope_ctx_var.set(request.scope)
 
         try:
             response = await call_next(request)
@@ -47,4 +55,4 @@ class RequestContextLogMiddleware(BaseHTTPMiddleware):
         response.headers['X-Correlation-ID'] = get_correlation_id()
         response.headers['X-Request-ID'] = get_request_id()
 
-        return response
\ No newline at end of file
+        return response
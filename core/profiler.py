@@ -0,0 +1,155 @@
+import logging
+import signal
+import threading
+import time
+
+from collections import Counter
+from typing import Any, Dict, List, Tuple
+
+from starlette.routing import Match
+
+from core.middleware import get_request_id, get_request_scope
+
+logger = logging.getLogger(__name__)
+
+Frame = Tuple[str, str, int]
+
+
+def resolve_route(scope: dict) -> str:
+    """The matched route template, so /users/{id}/usd groups every user"""
+    method = scope.get("method", "")
+    for route in scope["app"].router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return f"{method} {route.path}"
+    return f"{method} {scope['path']}"
+
+
+class SamplingProfiler:
+    def __init__(self) -> None:
+        """Signal driven stack sampler for the event loop thread.
+
+        SIGPROF fires on CPU time only, so an idle server takes no samples.
+        The handler runs on the main thread inside whatever task was
+        interrupted, which lets it read that request's context vars.
+        """
+        self.running = False
+        self.interval = 0.0
+        self.duration = 0.0
+        self._started = 0.0
+        self._samples: Counter = Counter()
+        # Route per request scope, resolved on the first sample taken for
+        # a request so requests pay nothing while the profiler is off.
+        self._routes: Dict[int, Tuple[dict, str]] = {}
+
+    @staticmethod
+    def available() -> bool:
+        # Signal handlers can only be installed from the main thread.
+        return (hasattr(signal, "SIGPROF")
+                and threading.current_thread() is threading.main_thread())
+
+    def start(self, interval: float) -> None:
+        """Start sampling
+
+        Args:
+            interval (float): seconds of CPU time between samples
+        """
+        if self.running:
+            raise RuntimeError("profiler already running")
+        self._samples = Counter()
+        self._routes = {}
+        self.interval = interval
+        self.running = True
+        self._started = time.perf_counter()
+        signal.signal(signal.SIGPROF, self._sample)
+        signal.setitimer(signal.ITIMER_PROF, interval, interval)
+        logger.info(f"Sampling profiler started every {interval}s")
+
+    def stop(self) -> None:
+        signal.setitimer(signal.ITIMER_PROF, 0)
+        signal.signal(signal.SIGPROF, signal.SIG_IGN)
+        self.duration = time.perf_counter() - self._started
+        self._routes = {}
+        self.running = False
+        logger.info(f"Sampling profiler stopped, "
+                    f"{sum(self._samples.values())} samples taken")
+
+    def _sample(self, signum, frame) -> None:
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+            frame = frame.f_back
+        stack.reverse()
+        key = (self._route(), get_request_id() or "-", tuple(stack))
+        self._samples[key] += 1
+
+    def _route(self) -> str:
+        scope = get_request_scope()
+        if scope is None:
+            return "-"
+        # Holding the scope keeps its id from being reused by a later
+        # request while the profile runs.
+        cached = self._routes.get(id(scope))
+        if cached is None or cached[0] is not scope:
+            cached = (scope, resolve_route(scope))
+            self._routes[id(scope)] = cached
+        return cached[1]
+
+    def collapsed(self) -> str:
+        """Samples in collapsed-stack format (flamegraph.pl, inferno)
+
+        Returns:
+            str: one `route;request_id;frame;... count` line per stack
+        """
+        lines = []
+        for (route, request_id, stack), count in self._samples.items():
+            frames = [
+                f"{name} ({filename}:{line})" for name, filename, line in stack
+            ]
+            lines.append(";".join([route, request_id] + frames) + f" {count}")
+        return "\n".join(lines) + "\n"
+
+    def speedscope(self) -> Dict[str, Any]:
+        """Samples in speedscope's sampled profile format
+
+        Returns:
+            Dict[str, Any]: speedscope file contents, the route and
+                request_id appear as the two outermost frames
+        """
+        frames: List[Dict[str, Any]] = []
+        frame_index: Dict[Frame, int] = {}
+
+        def index(frame: Frame) -> int:
+            if frame not in frame_index:
+                name, filename, line = frame
+                frame_index[frame] = len(frames)
+                frames.append({"name": name, "file": filename, "line": line})
+            return frame_index[frame]
+
+        samples = []
+        weights = []
+        for (route, request_id, stack), count in self._samples.items():
+            tags = [(route, "", 0), (request_id, "", 0)]
+            samples.append([index(frame) for frame in tags + list(stack)])
+            weights.append(count * self.interval)
+
+        return {
+            "$schema":
+            "https://www.speedscope.app/file-format-schema.json",
+            "shared": {
+                "frames": frames
+            },
+            "profiles": [{
+                "type": "sampled",
+                "name": "event loop",
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights,
+            }],
+        }
+
+
+profiler = SamplingProfiler()
@@ -0,0 +1,166 @@
+import asyncio
+import csv
+import logging
+import math
+import random
+
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from fastapi import HTTPException
+
+from api.endpoints.bitcoin import set_bitcoin_rate
+from database.data import in_memory_datastore
+
+logger = logging.getLogger(__name__)
+
+Tick = Tuple[float, float]
+
+
+def random_walk(start: float,
+                rate_hz: float,
+                volatility: float = 0.001,
+                drift: float = 0.0,
+                seed: Optional[int] = None) -> Iterator[Tick]:
+    """Endless geometric random walk of prices
+
+    Args:
+        start (float): the opening price
+        rate_hz (float): ticks per second
+        volatility (float): standard deviation of each log return
+        drift (float): mean of each log return
+        seed (Optional[int]): seed for a reproducible walk
+
+    Yields:
+        Iterator[Tick]: (seconds from start, price)
+    """
+    rng = random.Random(seed)
+    price = start
+    n = 0
+    while True:
+        n += 1
+        price *= math.exp(rng.gauss(drift, volatility))
+        yield (n / rate_hz, price)
+
+
+def replay(path: str) -> List[Tick]:
+    """Read recorded ticks from a `seconds,price` csv file
+
+    The file is read up front so a missing or unreadable file fails at
+    startup. Blank lines, lines starting with # and a header row are
+    skipped, other malformed rows are logged and skipped.
+
+    Args:
+        path (str): the tick file
+
+    Returns:
+        List[Tick]: (seconds from start, price)
+    """
+    ticks = []
+    with open(path, newline='') as f:
+        for line, row in enumerate(csv.reader(f), start=1):
+            if not row or row[0].startswith('#'):
+                continue
+            try:
+                ticks.append((float(row[0]), float(row[1])))
+            except (ValueError, IndexError):
+                if line > 1:
+                    logger.warning(
+                        f"Skipping malformed tick on line {line} of {path}")
+    return ticks
+
+
+class RateFeed:
+    def __init__(self,
+                 ticks: Iterable[Tick],
+                 speed: float = 1.0,
+                 max_batch: int = 1000) -> None:
+        """Applies scheduled ticks to the stored bitcoin rate.
+
+        Ticks are scheduled against absolute deadlines, so sleep jitter
+        does not accumulate. When the feed falls behind it applies due
+        ticks back to back, yielding to the event loop every max_batch
+        ticks so request handling is never starved.
+
+        Args:
+            ticks (Iterable[Tick]): (seconds from start, price) pairs
+            speed (float): replay speed multiplier
+            max_batch (int): ticks applied between forced yields
+        """
+        self.ticks = ticks
+        self.speed = speed
+        self.max_batch = max_batch
+        self.applied = 0
+        self.rejected = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def apply(self, price: float) -> None:
+        try:
+            set_bitcoin_rate(in_memory_datastore["bitcoin_rate"], price=price)
+        except HTTPException:
+            self.rejected += 1
+        else:
+            self.applied += 1
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        batch = 0
+
+        try:
+            for offset, price in self.ticks:
+                delay = started + offset / self.speed - loop.time()
+                if delay > 0:
+                    batch = 0
+                    await asyncio.sleep(delay)
+                elif batch >= self.max_batch:
+                    batch = 0
+                    await asyncio.sleep(0)
+                self.apply(price)
+                batch += 1
+        except Exception:
+            logger.exception(f"Rate feed crashed after {self.applied} ticks")
+            return
+
+        logger.info(f"Rate feed finished, {self.applied} ticks applied "
+                    f"and {self.rejected} rejected")
+
+    async def start(self) -> None:
+        logger.info("Starting rate feed")
+        self._task = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            logger.exception("Rate feed failed")
+        logger.info(f"Rate feed stopped, {self.applied} ticks applied "
+                    f"and {self.rejected} rejected")
+
+
+def build_rate_feed(settings) -> RateFeed:
+    if settings.RATE_FEED_SPEED <= 0:
+        raise ValueError("RATE_FEED_SPEED must be greater than 0")
+
+    if settings.RATE_FEED == "random":
+        if settings.RATE_FEED_HZ <= 0:
+            raise ValueError("RATE_FEED_HZ must be greater than 0")
+        ticks = random_walk(start=in_memory_datastore["bitcoin_rate"].price,
+                            rate_hz=settings.RATE_FEED_HZ,
+                            volatility=settings.RATE_FEED_VOLATILITY,
+                            drift=settings.RATE_FEED_DRIFT,
+                            seed=settings.RATE_FEED_SEED)
+    elif settings.RATE_FEED == "replay":
+        if not settings.RATE_FEED_FILE:
+            raise ValueError("RATE_FEED_FILE must be set to replay ticks")
+        ticks = replay(settings.RATE_FEED_FILE)
+        if not ticks:
+            raise ValueError(f"No ticks found in {settings.RATE_FEED_FILE}")
+    else:
+        raise ValueError(f"Unknown rate feed: {settings.RATE_FEED}")
+
+    return RateFeed(ticks, speed=settings.RATE_FEED_SPEED)
@@ -0,0 +1,123 @@
+import importlib.util
+import logging
+import os
+import sys
+import time
+
+from contextlib import contextmanager
+from importlib.machinery import SourceFileLoader
+from typing import Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ImportTimer:
+    def __init__(self, profile: "StartupProfile") -> None:
+        """Meta path hook timing each pure python module's execution.
+
+        Times are cumulative, a module's time includes the imports it
+        triggers, the same as the cumulative column of -X importtime.
+
+        Args:
+            profile (StartupProfile): receives one step per module
+        """
+        self.profile = profile
+        self._finding = False
+
+    def find_spec(self, name, path=None, target=None):
+        if self._finding:
+            return None
+        self._finding = True
+        try:
+            spec = importlib.util.find_spec(name)
+        except (ImportError, ValueError):
+            return None
+        finally:
+            self._finding = False
+
+        if spec is None or not isinstance(spec.loader, SourceFileLoader):
+            return None
+
+        exec_module = spec.loader.exec_module
+
+        def timed_exec_module(module):
+            with self.profile.step(f"import {name}"):
+                exec_module(module)
+
+        spec.loader.exec_module = timed_exec_module
+        return spec
+
+
+class StartupProfile:
+    def __init__(self, enabled: bool = False) -> None:
+        """Records how long each import and initialization step takes.
+
+        Disabled profiles skip the clock calls entirely so the default
+        startup path pays nothing for them.
+
+        Args:
+            enabled (bool): whether to record timings
+        """
+        self.enabled = enabled
+        self.started = time.perf_counter()
+        self.timings: List[Tuple[str, float]] = []
+        self._import_timer: Optional[ImportTimer] = None
+
+    def track_imports(self) -> None:
+        if self.enabled and self._import_timer is None:
+            self._import_timer = ImportTimer(self)
+            sys.meta_path.insert(0, self._import_timer)
+
+    def stop_tracking_imports(self) -> None:
+        if self._import_timer in sys.meta_path:
+            sys.meta_path.remove(self._import_timer)
+        self._import_timer = None
+
+    @contextmanager
+    def step(self, name: str) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings.append((name, (time.perf_counter() - start) * 1000))
+
+    def elapsed(self) -> float:
+        """Milliseconds since the profile was created"""
+        return (time.perf_counter() - self.started) * 1000
+
+    def report(self, budget_ms: float, top_imports: int = 20) -> None:
+        """Log recorded steps and the total against the budget
+
+        Args:
+            budget_ms (float): startup budget in milliseconds
+            top_imports (int): how many of the slowest imports to list
+        """
+        self.stop_tracking_imports()
+        if not self.enabled:
+            return
+
+        imports = [
+            step for step in self.timings if step[0].startswith("import ")
+        ]
+        for name, duration in self.timings:
+            if not name.startswith("import "):
+                logger.info(f"Startup step {name} took {duration:.2f}ms")
+        for name, duration in sorted(imports,
+                                     key=lambda step: -step[1])[:top_imports]:
+            logger.info(f"Startup step {name} took {duration:.2f}ms")
+
+        total = self.elapsed()
+        if total > budget_ms:
+            logger.warning(
+                f"Startup took {total:.2f}ms, over budget of {budget_ms}ms")
+        else:
+            logger.info(f"Startup took {total:.2f}ms (budget {budget_ms}ms)")
+
+
+# Read straight from the environment: this has to exist before core.config
+# is imported so that import can be timed too.
+startup_profile = StartupProfile(
+    enabled=os.environ.get("STARTUP_PROFILE", "").lower() in ("1", "true"))
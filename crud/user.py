@@ -1,14 +1,14 @@
 import logging
 
 from datetime import datetime
-from typing import Any, Dict, Generic, List, Optional, TypeVar, Union
+from typing import Any, Dict, Generic, List, Optional, Tuple, TypeVar, Union
 from uuid import uuid4
 
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
 from pydantic.networks import EmailStr
 
-from database.data import in_memory_datastore
+from database.data import in_memory_datastore, user_indexes
 from schema.users import UserIn, UserInDb, UserUpdate
 
 logger = logging.getLogger(__name__)
@@ -39,6 +39,43 @@ class CRUDUser:
         logger.info(f"Done transacting with db")
         return obj
 
+    def get_multi(self,
+                  *,
+                  sort_by: str,
+                  limit: int,
+                  descending: bool = False,
+                  after: Optional[Tuple[Any, str]] = None,
+                  lower: Any = None,
+                  upper: Any = None) -> List[UserInDb]:
+        """Get a page of users ordered by an indexed field
+
+        Args:
+            sort_by (str): the indexed field to order by
+            limit (int): maximum number of users to return
+            descending (bool): order from highest to lowest
+            after (Optional[Tuple[Any, str]]): (value, id) of the last user
+                on the previous page
+            lower (Any): inclusive lower bound on sort_by, None for none
+            upper (Any): inclusive upper bound on sort_by, None for none
+
+        Returns:
+            List[UserInDb]: the users on the page
+        """
+        logger.info(f"Acessing db to list users by {sort_by}")
+        users = in_memory_datastore["users"]
+
+        page = []
+        for _id in user_indexes[sort_by].scan(lower=lower,
+                                              upper=upper,
+                                              after=after,
+                                              reverse=descending):
+            page.append(users[_id])
+            if len(page) == limit:
+                break
+
+        logger.info(f"Done transacting with db")
+        return page
+
     def get_by_email(self, *, email: EmailStr) -> Optional[UserInDb]:
 
         logger.info(f"Attempting to retrieve user by email")
@@ -96,6 +133,7 @@ class CRUDUser:
 
         logger.info("Inserting user details into database")
         in_memory_datastore["users"][str(_id)] = db_obj
+        user_indexes.add(db_obj)
         logger.info("User sucessfully inserted into database")
 
         return db_obj
@@ -119,29 +157,38 @@ class CRUDUser:
         else:
             update_data = obj_in.dict(exclude_unset=True)
         update_data["updatedAt"] = datetime.now()
+        user_indexes.discard(db_obj)
         for field in db_data:
             if field in update_data:
                 setattr(db_obj, field, update_data[field])
         logger.info("Performing user details update")
         in_memory_datastore["users"][db_obj.id] = db_obj
+        user_indexes.add(db_obj)
 
         return db_obj
 
-    def deposit(self, *, id: Any, amount: float) -> UserInDb:
+    def deposit(self,
+                *,
+                id: Any,
+                amount: float,
+                obj: Optional[UserInDb] = None) -> UserInDb:
         """Deposit amount for user
 
         Args:
             id (Any): The user id
             amount (float): The amount
+            obj (Optional[UserInDb]): the user, if already fetched
 
         Returns:
             UserInDb: the db object
         """
-        logger.info("Acesssing database")
-        obj = self.get(id=id)
+        if obj is None:
+            logger.info("Acesssing database")
+            obj = self.get(id=id)
 
-        obj.usdBalance += amount
-        obj.updatedAt = datetime.now()
+        with user_indexes.updating(obj):
+            obj.usdBalance += amount
+            obj.updatedAt = datetime.now()
 
         in_memory_datastore["users"]["id"] = obj
         logger.info(f"User: {id} amount deposited and db updated")
@@ -149,25 +196,32 @@ class CRUDUser:
         return {"successful": True, "data": obj}
 
     def withdrawal(
-            self, *, id: Any,
-            amount: float) -> Union[UserInDb, Dict[str, Union[bool, str]]]:
+        self,
+        *,
+        id: Any,
+        amount: float,
+        obj: Optional[UserInDb] = None
+    ) -> Union[UserInDb, Dict[str, Union[bool, str]]]:
         """Withdrwal amount for user
 
         Args:
             id (Any): The user id
             amount (float): The amount
+            obj (Optional[UserInDb]): the user, if already fetched
 
         Returns:
             Union[UserInDb, Dict[str, Union[bool, str]]]: User Object ot Error Dict
         """
-        logger.info("Acesssing database")
-        obj = self.get(id=id)
+        if obj is None:
+            logger.info("Acesssing database")
+            obj = self.get(id=id)
         if amount > obj.usdBalance:
             logger.error(f"User: {id} has insufficent balance")
             return {"successful": False, "msg": "Insuffcient Usd Balance"}
 
-        obj.usdBalance -= amount
-        obj.updatedAt = datetime.now()
+        with user_indexes.updating(obj):
+            obj.usdBalance -= amount
+            obj.updatedAt = datetime.now()
 
         in_memory_datastore["users"]["id"] = obj
 
@@ -194,19 +248,26 @@ class CRUDUser:
         logger.info(f"User: {id} acessed coin conversion function")
         return value
 
-    def buy(self, *, id: Any,
-            amount: float) -> Union[UserInDb, Dict[str, Union[bool, str]]]:
+    def buy(
+        self,
+        *,
+        id: Any,
+        amount: float,
+        obj: Optional[UserInDb] = None
+    ) -> Union[UserInDb, Dict[str, Union[bool, str]]]:
         """Buy Bitcoin
 
         Args:
             id (Any): user_id
             amount (float): the usd amount available
+            obj (Optional[UserInDb]): the user, if already fetched
 
         Returns:
             Union[UserInDb, Dict[str, Union[bool, str]]]: User Object ot Error Dict
         """
-        logger.info("Acesssing database")
-        obj = self.get(id=id)
+        if obj is None:
+            logger.info("Acesssing database")
+            obj = self.get(id=id)
 
         coin_value = self.coin_conversion(amount, _type=1)
 
@@ -214,37 +275,46 @@ class CRUDUser:
             logger.error(f"User: {id} has insufficent balance")
             return {"successful": False, "msg": "Insuffcient Usd Balance"}
 
-        obj.usdBalance -= coin_value
-        obj.bitcoinAmount += amount
-        obj.updatedAt = datetime.now()
+        with user_indexes.updating(obj):
+            obj.usdBalance -= coin_value
+            obj.bitcoinAmount += amount
+            obj.updatedAt = datetime.now()
 
         in_memory_datastore["users"]["id"] = obj
         logger.info(f"User: {id} bought coins and db updated ")
 
         return {"successful": True, "data": obj}
 
-    def sell(self, *, id: Any,
-             amount: float) -> Union[UserInDb, Dict[str, Union[bool, str]]]:
+    def sell(
+        self,
+        *,
+        id: Any,
+        amount: float,
+        obj: Optional[UserInDb] = None
+    ) -> Union[UserInDb, Dict[str, Union[bool, str]]]:
         """Sell Bitcoin
 
         Args:
             id (Any): user_id
             amount (float): the usd amount available
+            obj (Optional[UserInDb]): the user, if already fetched
 
         Returns:
            Union[UserInDb, Dict[str, Union[bool, str]]]: User Object ot Error Dict
         """
-        logger.info("Acesssing database")
-        obj = self.get(id=id)
+        if obj is None:
+            logger.info("Acesssing database")
+            obj = self.get(id=id)
 
         if amount > obj.bitcoinAmount:
             return {"successful": False, "msg": "Insuffcient Bitcoin Balance"}
 
         cash = self.coin_conversion(amount=amount, _type=1)
 
-        obj.usdBalance += cash
-        obj.bitcoinAmount -= amount
-        obj.updatedAt = datetime.now()
+        with user_indexes.updating(obj):
+            obj.usdBalance += cash
+            obj.bitcoinAmount -= amount
+            obj.updatedAt = datetime.now()
 
         in_memory_datastore["users"]["id"] = obj
         logger.info(f"User: {id} sold coins and db updated")
@@ -270,4 +340,4 @@ class CRUDUser:
         return usd_amount
 
 
-user_crud = CRUDUser(UserInDb)
\ No newline at end of file
+user_crud = CRUDUser(UserInDb)
@@ -2,6 +2,7 @@ from datetime import datetime
 from typing import Any, Dict, Union
 
 from schema import UserInDb, BitcoinIn
+from database.index import UserIndexes
 
 init_data = {"price": 100.00, "updatedAt": datetime.now()}
 
@@ -12,3 +13,5 @@ in_memory_datastore: Dict[str, Union[Dict[str, UserInDb],
                                          "bitcoin_rate": bitcoin_price,
                                          "users": {}
                                      }
+
+user_indexes = UserIndexes()
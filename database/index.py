@@ -0,0 +1,194 @@
+from bisect import bisect_left, bisect_right, insort
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Sorts after every uuid string, used to make upper bounds inclusive.
+_MAX_ID = chr(0x10FFFF)
+
+Entry = Tuple[Any, str]
+Position = Tuple[int, int]
+
+
+class SortedIndex:
+    def __init__(self, field: str, load: int = 1000) -> None:
+        """Sorted (value, id) pairs for a single user field.
+
+        Entries are held in a list of sorted chunks of at most 2 * load
+        items, with the largest entry of each chunk kept in _maxes (the
+        sortedcontainers.SortedList layout). A write bisects _maxes and
+        then shifts a single chunk, so it costs O(log n + load) rather
+        than moving the whole index.
+
+        Args:
+            field (str): the UserInDb attribute being indexed
+            load (int): target chunk size
+        """
+        self.field = field
+        self.load = load
+        self._lists: List[List[Entry]] = []
+        self._maxes: List[Entry] = []
+        self._len = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def key(self, obj: Any) -> Entry:
+        return (getattr(obj, self.field), obj.id)
+
+    def add(self, obj: Any) -> None:
+        key = self.key(obj)
+        self._len += 1
+
+        if not self._maxes:
+            self._lists.append([key])
+            self._maxes.append(key)
+            return
+
+        pos = bisect_right(self._maxes, key)
+        if pos == len(self._maxes):
+            pos -= 1
+            self._lists[pos].append(key)
+            self._maxes[pos] = key
+        else:
+            insort(self._lists[pos], key)
+
+        chunk = self._lists[pos]
+        if len(chunk) > 2 * self.load:
+            half = chunk[self.load:]
+            del chunk[self.load:]
+            self._maxes[pos] = chunk[-1]
+            self._lists.insert(pos + 1, half)
+            self._maxes.insert(pos + 1, half[-1])
+
+    def discard(self, obj: Any) -> None:
+        key = self.key(obj)
+        pos = bisect_left(self._maxes, key)
+        if pos == len(self._maxes):
+            return
+
+        chunk = self._lists[pos]
+        idx = bisect_left(chunk, key)
+        if idx == len(chunk) or chunk[idx] != key:
+            return
+
+        del chunk[idx]
+        self._len -= 1
+        if not chunk:
+            del self._lists[pos]
+            del self._maxes[pos]
+        elif idx == len(chunk):
+            self._maxes[pos] = chunk[-1]
+
+    def _bisect_left(self, key: Entry) -> Position:
+        pos = bisect_left(self._maxes, key)
+        if pos == len(self._maxes):
+            return (pos, 0)
+        return (pos, bisect_left(self._lists[pos], key))
+
+    def _bisect_right(self, key: Entry) -> Position:
+        pos = bisect_right(self._maxes, key)
+        if pos == len(self._maxes):
+            return (pos, 0)
+        return (pos, bisect_right(self._lists[pos], key))
+
+    def _forward(self, start: Position) -> Iterator[Entry]:
+        pos, idx = start
+        for chunk in self._lists[pos:]:
+            for i in range(idx, len(chunk)):
+                yield chunk[i]
+            idx = 0
+
+    def _backward(self, stop: Position) -> Iterator[Entry]:
+        pos, idx = stop
+        if pos == len(self._lists):
+            if not self._lists:
+                return
+            pos -= 1
+            idx = len(self._lists[pos])
+        while pos >= 0:
+            chunk = self._lists[pos]
+            for i in range(idx - 1, -1, -1):
+                yield chunk[i]
+            pos -= 1
+            if pos >= 0:
+                idx = len(self._lists[pos])
+
+    def scan(self,
+             *,
+             lower: Any = None,
+             upper: Any = None,
+             after: Optional[Entry] = None,
+             reverse: bool = False) -> Iterator[str]:
+        """Walk user ids in index order
+
+        Args:
+            lower (Any): inclusive lower bound on the field value
+            upper (Any): inclusive upper bound on the field value
+            after (Optional[Entry]): keyset cursor, the (value, id) of the
+                last entry already returned
+            reverse (bool): walk in descending order
+
+        Yields:
+            Iterator[str]: user ids
+        """
+        floor = None if lower is None else (lower, )
+        ceiling = None if upper is None else (upper, _MAX_ID)
+
+        if reverse:
+            if after is not None and (ceiling is None or after <= ceiling):
+                entries = self._backward(self._bisect_left(after))
+            elif ceiling is not None:
+                entries = self._backward(self._bisect_right(ceiling))
+            else:
+                entries = self._backward((len(self._lists), 0))
+            for entry in entries:
+                if floor is not None and entry < floor:
+                    return
+                yield entry[1]
+        else:
+            if after is not None and (floor is None or after >= floor):
+                entries = self._forward(self._bisect_right(after))
+            elif floor is not None:
+                entries = self._forward(self._bisect_left(floor))
+            else:
+                entries = self._forward((0, 0))
+            for entry in entries:
+                if ceiling is not None and entry > ceiling:
+                    return
+                yield entry[1]
+
+
+class UserIndexes:
+    fields = ("createdAt", "updatedAt", "usdBalance", "bitcoinAmount")
+    # createdAt is set once on insert and never needs re-indexing.
+    mutable_fields = ("updatedAt", "usdBalance", "bitcoinAmount")
+
+    def __init__(self) -> None:
+        """One SortedIndex per sortable user field"""
+        self.indexes: Dict[str, SortedIndex] = {
+            field: SortedIndex(field)
+            for field in self.fields
+        }
+
+    def __getitem__(self, field: str) -> SortedIndex:
+        return self.indexes[field]
+
+    def add(self, obj: Any) -> None:
+        for index in self.indexes.values():
+            index.add(obj)
+
+    def discard(self, obj: Any) -> None:
+        for index in self.indexes.values():
+            index.discard(obj)
+
+    @contextmanager
+    def updating(self, obj: Any) -> Iterator[None]:
+        """Re-index the mutable fields of obj around an in place update"""
+        indexes = [self.indexes[field] for field in self.mutable_fields]
+        for index in indexes:
+            index.discard(obj)
+        try:
+            yield
+        finally:
+            for index in indexes:
+                index.add(obj)
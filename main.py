@@ -1,5 +1,7 @@
-from core.logger import setup_logging
-from datetime import datetime
+from core.startup import startup_profile
+
+startup_profile.track_imports()
+
 from core.factory import create_app
 
-app = create_app()
+app = create_app(profile=startup_profile)
@@ -1,2 +1,2 @@
 from .bitcoin import BitcoinIn
-from .users import UserIn, UserInDb, UserOut, UserUpdate, UserUsdTransaction, UserBitcoinTransaction, UserBalance
\ No newline at end of file
+from .users import UserIn, UserInDb, UserOut, UserUpdate, UserUsdTransaction, UserBitcoinTransaction, UserBalance, UserPage, UserSortField, SortOrder, UsdAction, BitcoinAction
\ No newline at end of file
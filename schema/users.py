@@ -15,6 +15,18 @@ class BitcoinAction(Enum):
     sell = "sell"
 
 
+class UserSortField(Enum):
+    createdAt = "createdAt"
+    updatedAt = "updatedAt"
+    usdBalance = "usdBalance"
+    bitcoinAmount = "bitcoinAmount"
+
+
+class SortOrder(Enum):
+    asc = "asc"
+    desc = "desc"
+
+
 class UserIn(BaseModel):
     username: str
     email: EmailStr
@@ -29,6 +41,11 @@ class UserOut(UserIn):
     updatedAt: datetime
 
 
+class UserPage(BaseModel):
+    data: List[UserOut]
+    next_cursor: Optional[str] = None
+
+
 class UserInDb(UserIn):
     id: str
     bitcoinAmount: float = 0.00
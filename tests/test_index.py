@@ -0,0 +1,71 @@
+import random
+
+from types import SimpleNamespace
+
+import pytest
+
+from database.index import SortedIndex
+
+
+def model_scan(entries, lower=None, upper=None, after=None, reverse=False):
+    entries = sorted(entries)
+    if lower is not None:
+        entries = [e for e in entries if e[0] >= lower]
+    if upper is not None:
+        entries = [e for e in entries if e[0] <= upper]
+    if after is not None:
+        entries = [e for e in entries if (e < after if reverse else e > after)]
+    if reverse:
+        entries.reverse()
+    return [e[1] for e in entries]
+
+
+@pytest.mark.parametrize("load", [1, 2, 3])
+def test_scan_matches_sorted_list_model(load):
+    rng = random.Random(load)
+    index = SortedIndex("value", load=load)
+    objs = {}
+
+    for step in range(600):
+        if objs and rng.random() < 0.4:
+            index.discard(objs.pop(rng.choice(sorted(objs))))
+        else:
+            obj = SimpleNamespace(value=rng.randint(0, 20), id=f"{step:04d}")
+            objs[obj.id] = obj
+            index.add(obj)
+
+        entries = [(obj.value, obj.id) for obj in objs.values()]
+        assert len(index) == len(entries)
+        if step % 10:
+            continue
+
+        for _ in range(10):
+            lower = rng.choice([None, rng.randint(-1, 21)])
+            upper = rng.choice([None, rng.randint(-1, 21)])
+            after = rng.choice(
+                [None, (rng.randint(0, 20), f"{step // 2:04d}")] + entries[:3])
+            for reverse in (False, True):
+                got = index.scan(lower=lower,
+                                 upper=upper,
+                                 after=after,
+                                 reverse=reverse)
+                expected = model_scan(entries, lower, upper, after, reverse)
+                assert list(got) == expected
+
+
+def test_discard_missing_entry_is_a_no_op():
+    index = SortedIndex("value", load=1)
+    obj = SimpleNamespace(value=1, id="a")
+    index.add(obj)
+
+    index.discard(SimpleNamespace(value=2, id="a"))
+    index.discard(SimpleNamespace(value=1, id="b"))
+
+    assert list(index.scan()) == ["a"]
+
+
+def test_scan_empty_index():
+    index = SortedIndex("value")
+
+    assert list(index.scan()) == []
+    assert list(index.scan(reverse=True)) == []
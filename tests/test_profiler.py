@@ -0,0 +1,34 @@
+import pytest
+
+from fastapi.testclient import TestClient
+
+from core.profiler import profiler
+from crud import user_crud
+from main import app
+
+client = TestClient(app)
+
+
+@pytest.mark.skipif(not profiler.available(), reason="needs SIGPROF")
+def test_samples_are_tagged_with_route_template():
+    user = user_crud.create(
+        obj_in={
+            "username": "profiled",
+            "email": "profiled@example.com",
+            "name": "profiled"
+        })
+
+    profiler.start(interval=0.0005)
+    try:
+        for _ in range(300):
+            client.post(f"/users/{user.id}/usd",
+                        json={
+                            "action": "deposit",
+                            "amount": 1
+                        })
+    finally:
+        profiler.stop()
+
+    routes = {line.split(";")[0] for line in profiler.collapsed().splitlines()}
+    assert "POST /users/{id}/usd" in routes
+    assert f"POST /users/{user.id}/usd" not in routes
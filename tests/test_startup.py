@@ -0,0 +1,37 @@
+import subprocess
+import sys
+
+from pathlib import Path
+
+from core.config import settings
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# requests is only needed by the test client, it is imported before main
+# so its import time is not charged to the app. The clock starts when
+# main imports core.startup.
+FIRST_REQUEST = """
+import requests
+
+import main
+from starlette.testclient import TestClient
+
+with TestClient(main.app) as client:
+    assert client.get("/bitcoin/").status_code == 200
+    print(f"startup_ms={main.startup_profile.elapsed()}")
+"""
+
+
+def test_cold_start_to_first_request_within_budget():
+    result = subprocess.run([sys.executable, "-c", FIRST_REQUEST],
+                            cwd=ROOT,
+                            check=True,
+                            stdout=subprocess.PIPE,
+                            universal_newlines=True)
+    line = next(line for line in result.stdout.splitlines()
+                if line.startswith("startup_ms="))
+    elapsed_ms = float(line.split("=", 1)[1])
+
+    assert elapsed_ms <= settings.STARTUP_BUDGET_MS, (
+        f"cold start took {elapsed_ms:.0f}ms, "
+        f"budget is {settings.STARTUP_BUDGET_MS}ms")
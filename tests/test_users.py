@@ -0,0 +1,123 @@
+import base64
+import json
+
+import pytest
+
+from fastapi.testclient import TestClient
+
+from crud import user_crud
+from database.data import in_memory_datastore
+from main import app
+
+client = TestClient(app)
+
+SORT_FIELDS = ["createdAt", "updatedAt", "usdBalance", "bitcoinAmount"]
+
+
+def make_cursor(*parts):
+    return base64.urlsafe_b64encode(json.dumps(parts).encode()).decode()
+
+
+@pytest.fixture(scope="module", autouse=True)
+def users():
+    for n in range(23):
+        obj = user_crud.create(
+            obj_in={
+                "username": f"list{n}",
+                "email": f"list{n}@example.com",
+                "name": "list"
+            })
+        # Repeated balances exercise the id tie break.
+        user_crud.deposit(id=obj.id, amount=n % 5 * 1000, obj=obj)
+        if n % 3:
+            user_crud.buy(id=obj.id, amount=n % 4, obj=obj)
+
+
+def stored_users():
+    return {obj.id: obj for obj in in_memory_datastore["users"].values()}
+
+
+@pytest.mark.parametrize("order", ["asc", "desc"])
+@pytest.mark.parametrize("sort_by", SORT_FIELDS)
+def test_cursor_walk_returns_every_user_in_order(sort_by, order):
+    seen = []
+    params = {"sort_by": sort_by, "order": order, "limit": 4}
+    while True:
+        response = client.get("/users/", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page["data"]) <= 4
+        seen.extend(user["id"] for user in page["data"])
+        if page["next_cursor"] is None:
+            break
+        params["cursor"] = page["next_cursor"]
+
+    expected = sorted(stored_users().values(),
+                      key=lambda obj: (getattr(obj, sort_by), obj.id),
+                      reverse=order == "desc")
+    assert seen == [obj.id for obj in expected]
+
+
+def test_range_filter_on_sort_field_is_inclusive():
+    response = client.get("/users/",
+                          params={
+                              "sort_by": "usdBalance",
+                              "usd_balance_min": 1000,
+                              "usd_balance_max": 2000,
+                              "limit": 500
+                          })
+
+    assert response.status_code == 200
+    balances = [user["usdBalance"] for user in response.json()["data"]]
+    expected = sorted(obj.usdBalance for obj in stored_users().values()
+                      if 1000 <= obj.usdBalance <= 2000)
+    assert balances == expected
+
+
+def test_timezone_aware_filter_is_accepted():
+    response = client.get("/users/",
+                          params={
+                              "created_after": "2000-01-01T00:00:00Z",
+                              "limit": 500
+                          })
+
+    assert response.status_code == 200
+    assert len(response.json()["data"]) == len(stored_users())
+
+
+@pytest.mark.parametrize("params, msg", [
+    ({
+        "sort_by": "createdAt",
+        "usd_balance_min": 1e300
+    }, "range filters must be on the sort_by field"),
+    ({
+        "sort_by": "usdBalance",
+        "usd_balance_min": "nan"
+    }, "invalid filter"),
+    ({
+        "created_after": "0001-01-01T00:00:00+14:00"
+    }, "invalid filter"),
+    ({
+        "cursor": "not a cursor"
+    }, "invalid cursor"),
+    ({
+        "sort_by": "usdBalance",
+        "cursor": make_cursor("createdAt", 1.0, "a")
+    }, "invalid cursor"),
+    ({
+        "sort_by": "usdBalance",
+        "cursor": make_cursor("usdBalance", 1.0, 5)
+    }, "invalid cursor"),
+    ({
+        "sort_by": "usdBalance",
+        "cursor": make_cursor("usdBalance", "nan", "a")
+    }, "invalid cursor"),
+    ({
+        "cursor": make_cursor("createdAt", "0001-01-01T00:00:00+14:00", "a")
+    }, "invalid cursor"),
+])
+def test_invalid_list_params_return_400(params, msg):
+    response = client.get("/users/", params=params)
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == {"status": "error", "msg": msg}